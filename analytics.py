@@ -1,10 +1,28 @@
 from __future__ import annotations
 
+import inspect
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from functools import wraps
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+# Results are cached per DataFrame identity. Stored datasets are never mutated
+# after ingest, and every entry keeps a reference to its input frame so that
+# `id(df)` cannot be recycled while the entry is alive.
+_CACHE_MAXSIZE = 128
+_CACHE: "OrderedDict[Tuple[Any, ...], Tuple[pd.DataFrame, pd.DataFrame]]" = OrderedDict()
+_CACHE_LOCK = Lock()
+
+# Aggregations served by `_group_reduce` for categorical regions.
+_KERNEL_AGGS = frozenset({"sum", "mean", "min", "max"})
+# Counting reductions work on any dtype and handle missing values themselves,
+# so `region_aggregate` applies them to the raw column without numeric coercion.
+_RAW_VALUE_AGGS = frozenset({"count", "nunique", "size"})
+
 
 @dataclass(frozen=True)
 class RegionValue:
@@ -16,8 +34,117 @@ def _require_columns(df: pd.DataFrame, cols: List[str]) -> None:
     missing = [c for c in cols if c not in df.columns]
     if missing:
         raise ValueError(f"Missing required columns: {missing}")
+    ambiguous = [c for c in cols if not isinstance(df[c], pd.Series)]
+    if ambiguous:
+        raise ValueError(f"Ambiguous (repeated) columns: {ambiguous}")
+
+
+def _decategorize(s: pd.Series) -> pd.Series:
+    # Stored datasets keep low-cardinality text columns as categoricals (see
+    # `store.DatasetStore`); hand results back with the original value dtype.
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return s.astype(s.cat.categories.dtype)
+    return s
+
+
+def _group_reduce(codes: np.ndarray, values: np.ndarray, n_groups: int, agg: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Single-pass grouped reduction over non-negative integer group codes.
+
+    Returns `(observed group codes, reduced values)`. `values` must not
+    contain NaN; `region_aggregate` drops invalid rows before grouping.
+    `sum`/`mean` are only dispatched here for integer values (see
+    `_kernel_aggregate`).
+    """
+    counts = np.bincount(codes, minlength=n_groups)
+    observed = np.flatnonzero(counts)
+
+    if agg in ("sum", "mean"):
+        sums = np.zeros(n_groups, dtype=values.dtype)
+        np.add.at(sums, codes, values)
+        out = sums if agg == "sum" else sums / np.maximum(counts, 1)
+    elif values.dtype.kind == "f":
+        out = np.full(n_groups, np.nan)
+        (np.fmax if agg == "max" else np.fmin).at(out, codes, values)
+    else:
+        info = np.iinfo(values.dtype)
+        out = np.full(n_groups, info.min if agg == "max" else info.max, dtype=values.dtype)
+        (np.maximum if agg == "max" else np.minimum).at(out, codes, values)
+    return observed, out[observed]
+
+
+def _sorted_reduce(codes: np.ndarray, values: np.ndarray, agg: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Like `_group_reduce`, for codes that are already sorted: reduce each run of
+    equal codes with `ufunc.reduceat` in one linear pass.
+    """
+    if len(codes) == 0:
+        return codes, values
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    if agg == "mean":
+        out = np.add.reduceat(values, starts) / np.diff(np.r_[starts, len(codes)])
+    elif agg == "sum":
+        out = np.add.reduceat(values, starts)
+    else:
+        out = (np.maximum if agg == "max" else np.minimum).reduceat(values, starts)
+    return codes[starts], out
+
+
+def _kernel_aggregate(
+    regions: pd.Series, values: pd.Series, agg: str, presorted: bool = False
+) -> Optional[pd.DataFrame]:
+    # Fast path for categorical regions with a plain numeric value column;
+    # returns None when pandas' generic groupby is needed instead.
+    if agg not in _KERNEL_AGGS or not isinstance(regions.dtype, pd.CategoricalDtype):
+        return None
+    if not isinstance(values.dtype, np.dtype) or values.dtype.kind not in "iuf":
+        return None
+    if agg in ("sum", "mean") and values.dtype.kind == "f":
+        # pandas sums floats with Kahan compensation; naive accumulation here
+        # would drift (e.g. eight 0.1s summing to 0.7999999999999999).
+        return None
+    codes = regions.cat.codes.to_numpy()
+    if (codes < 0).any():
+        # Missing regions form their own group (dropna=False); leave that to pandas.
+        return None
+    categories = regions.cat.categories
+    if presorted:
+        groups, reduced = _sorted_reduce(codes, values.to_numpy(), agg)
+    else:
+        groups, reduced = _group_reduce(codes.astype(np.intp), values.to_numpy(), len(categories), agg)
+    return pd.DataFrame({"region": categories.take(groups), "value": reduced})
+
+
+def _frame_cache(func: Callable[..., pd.DataFrame]) -> Callable[..., pd.DataFrame]:
+    """
+    Memoize `func(df, **kwargs)` in a shared LRU keyed on `(id(df), args)`.
+
+    Callers must treat the returned DataFrame as read-only.
+    """
+    sig = inspect.signature(func)
+
+    @wraps(func)
+    def wrapper(df: pd.DataFrame, **kwargs: Any) -> pd.DataFrame:
+        bound = sig.bind(df, **kwargs)
+        bound.apply_defaults()
+        key = (func.__name__, id(df), *list(bound.arguments.items())[1:])
+        with _CACHE_LOCK:
+            hit = _CACHE.get(key)
+            if hit is not None:
+                _CACHE.move_to_end(key)
+                return hit[1]
+
+        out = func(df, **kwargs)
+        with _CACHE_LOCK:
+            _CACHE[key] = (df, out)
+            while len(_CACHE) > _CACHE_MAXSIZE:
+                _CACHE.popitem(last=False)
+        return out
 
+    return wrapper
 
+
+@_frame_cache
 def region_aggregate(
     df: pd.DataFrame,
     *,
@@ -26,23 +153,64 @@ def region_aggregate(
     agg: str = "sum",
     lat_col: Optional[str] = None,
     lon_col: Optional[str] = None,
+    presorted: bool = False,
 ) -> pd.DataFrame:
+    """
+    Aggregate `value_col` per region, sorted by value (descending).
+
+    `presorted=True` asserts that `df` is sorted by a categorical `region_col`
+    (see `store.DatasetStore`), enabling a run-based reduction without hashing.
+    """
     _require_columns(df, [region_col, value_col])
-    grouped = df.groupby(region_col, dropna=False)[value_col].agg(agg).reset_index()
-    grouped = grouped.rename(columns={region_col: "region", value_col: "value"})
+
+    regions = df[region_col]
+    if agg in _RAW_VALUE_AGGS:
+        values = df[value_col]
+        grouped = None
+    else:
+        # Drop invalid values up front so they never reach the groupby.
+        values = pd.to_numeric(df[value_col], errors="coerce")
+        valid = values.notna().to_numpy()
+        if not valid.all():
+            regions, values = regions[valid], values[valid]
+        grouped = _kernel_aggregate(regions, values, agg, presorted=presorted)
+
+    if grouped is None:
+        grouped = (
+            values.groupby(regions, dropna=False, observed=True)
+            .agg(agg)
+            .rename_axis("region")
+            .reset_index(name="value")
+        )
 
     if lat_col and lon_col and lat_col in df.columns and lon_col in df.columns:
         # Use mean coordinate per region for mapping.
-        coords = df.groupby(region_col, dropna=False)[[lat_col, lon_col]].mean(numeric_only=True).reset_index()
+        coords = (
+            df.groupby(region_col, dropna=False, observed=True)[[lat_col, lon_col]]
+            .mean(numeric_only=True)
+            .reset_index()
+        )
         coords = coords.rename(columns={region_col: "region", lat_col: "lat", lon_col: "lon"})
         grouped = grouped.merge(coords, on="region", how="left")
 
-    grouped["value"] = pd.to_numeric(grouped["value"], errors="coerce")
+    grouped["region"] = _decategorize(grouped["region"])
+
+    # Some reductions (e.g. std over a single row) can still yield NaN.
     grouped = grouped.dropna(subset=["value"])
-    grouped = grouped.sort_values("value", ascending=False, kind="mergesort").reset_index(drop=True)
+    grouped = grouped.sort_values("value", ascending=False).reset_index(drop=True)
     return grouped
 
 
+def _split_rankings(agg_df: pd.DataFrame, top_n: int) -> Tuple[List[RegionValue], List[RegionValue]]:
+    # `agg_df` is already sorted by value, descending.
+    regions = agg_df["region"].to_numpy(dtype=object)
+    amounts = agg_df["value"].to_numpy(dtype=np.float64)
+    values = [RegionValue(region=str(r), value=float(v)) for r, v in zip(regions, amounts)]
+    top = values[: max(0, int(top_n))]
+    bottom = list(reversed(values[-max(0, int(top_n)) :])) if top_n > 0 else []
+    return top, bottom
+
+
 def rankings(
     df: pd.DataFrame,
     *,
@@ -52,15 +220,30 @@ def rankings(
     top_n: int = 5,
 ) -> Tuple[List[RegionValue], List[RegionValue]]:
     agg_df = region_aggregate(df, region_col=region_col, value_col=value_col, agg=agg)
-    values = [
-        RegionValue(region=str(r["region"]), value=float(r["value"]))
-        for r in agg_df[["region", "value"]].to_dict(orient="records")
-    ]
-    top = values[: max(0, int(top_n))]
-    bottom = list(reversed(values[-max(0, int(top_n)) :])) if top_n > 0 else []
-    return top, bottom
+    return _split_rankings(agg_df, top_n)
 
 
+def _period_ends(stamps: np.ndarray, freq: str) -> Optional[np.ndarray]:
+    """
+    Label naive UTC `datetime64` values with the last day of their `freq` bucket,
+    matching `pd.Grouper(freq=freq)` labels. Returns None for frequencies
+    without a NumPy equivalent; callers fall back to `pd.Grouper`.
+    """
+    if freq == "D":
+        return stamps.astype("datetime64[D]")
+    if freq in ("W", "W-SUN"):
+        days = stamps.astype("datetime64[D]")
+        # 1970-01-01 was a Thursday; shift so Monday == 0 and roll forward to Sunday.
+        weekday = (days.view(np.int64) + 3) % 7
+        return days + (6 - weekday)
+    if freq == "ME":
+        return (stamps.astype("datetime64[M]") + 1).astype("datetime64[D]") - 1
+    if freq == "YE":
+        return (stamps.astype("datetime64[Y]") + 1).astype("datetime64[D]") - 1
+    return None
+
+
+@_frame_cache
 def trends(
     df: pd.DataFrame,
     *,
@@ -82,19 +265,32 @@ def trends(
     if freq == "M":
         freq = "ME"
 
-    tmp = tmp.set_index(date_col)
-    out = (
-        tmp.groupby([pd.Grouper(freq=freq), region_col], dropna=False)[value_col]
-        .agg(agg)
-        .reset_index()
-        .rename(columns={region_col: "region", value_col: "value"})
-    )
-
     # Ensure output always includes a "date" string column, even if the caller's
     # input date column is also named "date".
     bucket_col = "__bucket__"
-    out = out.rename(columns={date_col: bucket_col})
-    out["date"] = out[bucket_col].dt.date.astype(str)
+    ends = _period_ends(tmp[date_col].dt.tz_convert(None).to_numpy(), freq)
+    if ends is not None:
+        buckets = pd.Series(ends, index=tmp.index, name=bucket_col)
+        out = (
+            tmp[value_col]
+            .groupby([buckets, tmp[region_col]], dropna=False, observed=True, sort=False)
+            .agg(agg)
+            .reset_index()
+            .rename(columns={region_col: "region", value_col: "value"})
+        )
+        out["date"] = np.datetime_as_string(out[bucket_col].to_numpy(dtype="datetime64[D]"), unit="D")
+    else:
+        tmp = tmp.set_index(date_col)
+        out = (
+            tmp.groupby([pd.Grouper(freq=freq), region_col], dropna=False, observed=True)[value_col]
+            .agg(agg)
+            .reset_index()
+            .rename(columns={region_col: "region", value_col: "value"})
+        )
+        out = out.rename(columns={date_col: bucket_col})
+        out["date"] = out[bucket_col].dt.date.astype(str)
+
+    out["region"] = _decategorize(out["region"])
     out = out.drop(columns=[bucket_col]).sort_values(["date", "region"]).reset_index(drop=True)
     return out
 
@@ -120,13 +316,15 @@ def executive_summary(
         }
 
     total = float(agg_df["value"].sum())
-    top, bottom = rankings(df, region_col=region_col, value_col=value_col, agg=agg, top_n=top_n)
+    top, bottom = _split_rankings(agg_df, top_n)
 
     best = top[0]
     worst = bottom[0] if bottom else top[-1]
 
+    inv_total = 0.0 if total == 0 else 100.0 / total
+
     def pct(v: float) -> float:
-        return 0.0 if total == 0 else (v / total) * 100.0
+        return v * inv_total
 
     key_findings: List[str] = [
         f"Top region: {best.region} ({best.value:,.2f} {metric}, {pct(best.value):.1f}% of total).",
@@ -134,11 +332,12 @@ def executive_summary(
         f"Total across regions: {total:,.2f} {metric}.",
     ]
 
+    # Top entries first, then bottom entries not already listed; format each once.
+    label = f"{metric}_{agg}"
     regional_comparison: Dict[str, Dict[str, str]] = {}
-    for rv in top:
-        regional_comparison[rv.region] = {f"{metric}_{agg}": f"{rv.value:,.2f}"}
-    for rv in bottom:
-        regional_comparison.setdefault(rv.region, {f"{metric}_{agg}": f"{rv.value:,.2f}"})
+    for rv in top + bottom:
+        if rv.region not in regional_comparison:
+            regional_comparison[rv.region] = {label: f"{rv.value:,.2f}"}
 
     return {
         "summary": f"{best.region} leads on {metric} ({agg}), while {worst.region} lags.",
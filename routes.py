@@ -2,14 +2,56 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
-from fastapi import APIRouter, File, HTTPException, Query, UploadFile
+import pyarrow.csv as pacsv
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
 
-from analytics import executive_summary, region_aggregate, trends
+from analytics import executive_summary, trends
 from store import SAMPLE_DATASET_ID, STORE
 
 router = APIRouter()
 
+
+def _lookup_dataset(dataset_id: str) -> pd.DataFrame:
+    try:
+        return STORE.get(dataset_id)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset_id: {dataset_id}") from e
+
+
+def get_dataset(dataset_id: str = Query(SAMPLE_DATASET_ID)) -> pd.DataFrame:
+    """Resolve the `dataset_id` query parameter; FastAPI caches it per request."""
+    return _lookup_dataset(dataset_id)
+
+
+def get_path_dataset(dataset_id: str) -> pd.DataFrame:
+    """Resolve the `{dataset_id}` path parameter."""
+    return _lookup_dataset(dataset_id)
+
+
+def _mangle_duplicate_columns(names: List[str]) -> List[str]:
+    """
+    Name CSV header columns the way `pd.read_csv` does: blank headers become
+    "Unnamed: {i}", and repeats of a name get ".1", ".2", ... appended to the
+    base name, skipping any name already present in the header.
+    """
+    header = [name if name else f"Unnamed: {i}" for i, name in enumerate(names)]
+    unnamed = [i for i, name in enumerate(names) if not name]
+    counts: Dict[str, int] = {}
+    # Named columns keep their names ahead of unnamed ones.
+    for i in [i for i in range(len(header)) if i not in unnamed] + unnamed:
+        base = col = header[i]
+        cur = counts.get(col, 0)
+        while cur > 0:
+            counts[base] = cur + 1
+            col = f"{base}.{cur}"
+            cur = cur + 1 if col in header else counts.get(col, 0)
+        header[i] = col
+        counts[col] = cur + 1
+    return header
+
+
 @router.get("/health")
 def health() -> Dict[str, str]:
     return {"status": "ok"}
@@ -21,20 +63,16 @@ def list_datasets() -> List[Dict[str, Any]]:
 
 
 @router.get("/datasets/{dataset_id}/schema")
-def dataset_schema(dataset_id: str) -> Dict[str, Any]:
-    try:
-        df = STORE.get(dataset_id)
-    except KeyError as e:
-        raise HTTPException(status_code=404, detail=f"Unknown dataset_id: {dataset_id}") from e
+def dataset_schema(dataset_id: str, df: pd.DataFrame = Depends(get_path_dataset)) -> Dict[str, Any]:
     return {"dataset_id": dataset_id, "columns": [str(c) for c in df.columns.to_list()], "rows": int(len(df))}
 
 
 @router.get("/datasets/{dataset_id}/preview")
-def dataset_preview(dataset_id: str, limit: int = Query(10, ge=1, le=200)) -> Dict[str, Any]:
-    try:
-        df = STORE.get(dataset_id)
-    except KeyError as e:
-        raise HTTPException(status_code=404, detail=f"Unknown dataset_id: {dataset_id}") from e
+def dataset_preview(
+    dataset_id: str,
+    limit: int = Query(10, ge=1, le=200),
+    df: pd.DataFrame = Depends(get_path_dataset),
+) -> Dict[str, Any]:
     preview = df.head(int(limit)).to_dict(orient="records")
     return {"dataset_id": dataset_id, "rows": int(len(df)), "preview": preview}
 
@@ -51,9 +89,17 @@ def ingest_json(records: List[Dict[str, Any]], name: Optional[str] = Query(None)
 async def ingest_csv(file: UploadFile = File(...), name: Optional[str] = Query(None)) -> Dict[str, Any]:
     if not file.filename or not file.filename.lower().endswith(".csv"):
         raise HTTPException(status_code=400, detail="Upload a .csv file.")
-    raw = await file.read()
     try:
-        df = pd.read_csv(pd.io.common.BytesIO(raw))
+        # Parse straight from the spooled upload; pyarrow's reader is multithreaded
+        # and avoids holding the raw bytes alongside the parsed frame.
+        table = pacsv.read_csv(
+            file.file,
+            read_options=pacsv.ReadOptions(use_threads=True, block_size=1 << 20),
+            # Blank cells are missing values, as with pd.read_csv.
+            convert_options=pacsv.ConvertOptions(strings_can_be_null=True),
+        )
+        table = table.rename_columns(_mangle_duplicate_columns(table.column_names))
+        df = table.to_pandas(split_blocks=True, self_destruct=True)
     except Exception as e:  # noqa: BLE001 - surface parse errors to user
         raise HTTPException(status_code=400, detail=f"CSV parse error: {e}") from e
 
@@ -69,16 +115,12 @@ def get_regions(
     lat_col: str = Query("lat"),
     lon_col: str = Query("lon"),
     agg: str = Query("sum"),
+    df: pd.DataFrame = Depends(get_dataset),
 ) -> List[Dict[str, Any]]:
     """
     Backwards-compatible endpoint used by the Leaflet dashboard demo.
     Returns one row per region with a single numeric value.
     """
-    try:
-        df = STORE.get(dataset_id)
-    except KeyError as e:
-        raise HTTPException(status_code=404, detail=f"Unknown dataset_id: {dataset_id}") from e
-
     if metric not in df.columns:
         # Fallback to legacy "value" column if present.
         if "value" in df.columns:
@@ -92,26 +134,33 @@ def get_regions(
         value_col = metric
 
     try:
-        agg_df = region_aggregate(
-            df,
+        agg_df = STORE.aggregate(
+            dataset_id,
             region_col=region_col,
             value_col=value_col,
             agg=agg,
             lat_col=lat_col,
             lon_col=lon_col,
+            df=df,
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
 
+    n = len(agg_df)
+    regions = agg_df["region"].to_numpy(dtype=object)
+    values = agg_df["value"].to_numpy(dtype=np.float64)
+    lats = agg_df["lat"].to_numpy(dtype=np.float64) if "lat" in agg_df.columns else np.full(n, np.nan)
+    lons = agg_df["lon"].to_numpy(dtype=np.float64) if "lon" in agg_df.columns else np.full(n, np.nan)
+
     out: List[Dict[str, Any]] = []
-    for r in agg_df.to_dict(orient="records"):
+    for region, value, lat, lon in zip(regions, values, lats, lons):
         out.append(
             {
-                "region": r["region"],
+                "region": region,
                 "metric": metric,
-                "value": float(r["value"]),
-                "lat": None if "lat" not in r or pd.isna(r["lat"]) else float(r["lat"]),
-                "lon": None if "lon" not in r or pd.isna(r["lon"]) else float(r["lon"]),
+                "value": float(value),
+                "lat": None if np.isnan(lat) else float(lat),
+                "lon": None if np.isnan(lon) else float(lon),
             }
         )
     return out
@@ -123,16 +172,15 @@ def analytics_regions(
     value_col: str = Query("revenue"),
     region_col: str = Query("region"),
     agg: str = Query("sum"),
+    df: pd.DataFrame = Depends(get_dataset),
 ) -> Dict[str, Any]:
     try:
-        df = STORE.get(dataset_id)
-    except KeyError as e:
-        raise HTTPException(status_code=404, detail=f"Unknown dataset_id: {dataset_id}") from e
-    try:
-        out = region_aggregate(df, region_col=region_col, value_col=value_col, agg=agg)
+        out = STORE.aggregate(dataset_id, region_col=region_col, value_col=value_col, agg=agg, df=df)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
-    return {"dataset_id": dataset_id, "value_col": value_col, "agg": agg, "regions": out.to_dict(orient="records")}
+    # Columnar payload: {"region": [...], "value": [...]}.
+    regions = {str(c): out[c].tolist() for c in out.columns}
+    return {"dataset_id": dataset_id, "value_col": value_col, "agg": agg, "regions": regions}
 
 
 @router.get("/analytics/trends")
@@ -143,11 +191,8 @@ def analytics_trends(
     value_col: str = Query("revenue"),
     agg: str = Query("sum"),
     freq: str = Query("M"),
+    df: pd.DataFrame = Depends(get_dataset),
 ) -> Dict[str, Any]:
-    try:
-        df = STORE.get(dataset_id)
-    except KeyError as e:
-        raise HTTPException(status_code=404, detail=f"Unknown dataset_id: {dataset_id}") from e
     try:
         out = trends(df, date_col=date_col, region_col=region_col, value_col=value_col, agg=agg, freq=freq)
     except ValueError as e:
@@ -157,7 +202,12 @@ def analytics_trends(
         "value_col": value_col,
         "agg": agg,
         "freq": freq,
-        "series": out.to_dict(orient="records"),
+        # Columnar payload: no repeated keys per point.
+        "series": {
+            "date": out["date"].tolist(),
+            "region": out["region"].tolist(),
+            "value": out["value"].astype(float).tolist(),
+        },
     }
 
 
@@ -169,11 +219,8 @@ def analytics_executive_summary(
     value_col: str = Query("revenue"),
     agg: str = Query("sum"),
     top_n: int = Query(3, ge=1, le=10),
+    df: pd.DataFrame = Depends(get_dataset),
 ) -> Dict[str, Any]:
-    try:
-        df = STORE.get(dataset_id)
-    except KeyError as e:
-        raise HTTPException(status_code=404, detail=f"Unknown dataset_id: {dataset_id}") from e
     try:
         out = executive_summary(
             df, metric=metric, region_col=region_col, value_col=value_col, agg=agg, top_n=int(top_n)
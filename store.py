@@ -1,12 +1,22 @@
 from __future__ import annotations
 
+import secrets
 from dataclasses import dataclass
 from threading import RLock
-from typing import Any, Dict, List, Optional
-from uuid import uuid4
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 import pandas as pd
 
+from analytics import region_aggregate
+
+# (region_col, value_col, agg, lat_col, lon_col) combinations requested by the
+# dashboard's default calls; aggregated eagerly at ingest when the columns exist.
+AggKey = Tuple[str, str, str, Optional[str], Optional[str]]
+PRECOMPUTED_AGGREGATES: Tuple[AggKey, ...] = (
+    ("region", "revenue", "sum", None, None),  # /analytics/regions
+    ("region", "revenue", "sum", "lat", "lon"),  # /regions
+)
+
 
 @dataclass(frozen=True)
 class DatasetMeta:
@@ -16,6 +26,66 @@ class DatasetMeta:
     columns: List[str]
 
 
+def _categorize(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Store low-cardinality text columns (regions, segments, ...) as categoricals.
+
+    Groupbys on categoricals run over integer codes instead of re-hashing every
+    string on each analytics call.
+    """
+    limit = len(df) / 2
+    positions: List[int] = []
+    # Walk columns positionally: names may repeat, and `df[name]` would then
+    # return a DataFrame rather than a Series.
+    for i, (_, s) in enumerate(df.items()):
+        if not (s.dtype == object or pd.api.types.is_string_dtype(s.dtype)):
+            continue
+        try:
+            if s.nunique() < limit:
+                positions.append(i)
+        except TypeError:
+            # Unhashable values (e.g. nested JSON objects); leave as-is.
+            continue
+    if not positions:
+        return df
+    df = df.copy(deep=False)
+    for i in positions:
+        df.isetitem(i, df.iloc[:, i].astype("category"))
+    return df
+
+
+def _sorted_columns(df: pd.DataFrame) -> FrozenSet[str]:
+    # Categorical columns the frame is already sorted by (common for exported
+    # CSVs); region aggregates over them can reduce runs instead of hashing.
+    return frozenset(
+        c
+        for c, s in df.items()
+        if isinstance(s.dtype, pd.CategoricalDtype) and s.notna().all() and s.is_monotonic_increasing
+    )
+
+
+def _precompute_aggregates(df: pd.DataFrame, sorted_by: FrozenSet[str]) -> Dict[AggKey, pd.DataFrame]:
+    out: Dict[AggKey, pd.DataFrame] = {}
+    for key in PRECOMPUTED_AGGREGATES:
+        region_col, value_col, agg, lat_col, lon_col = key
+        if region_col not in df.columns or value_col not in df.columns:
+            continue
+        try:
+            out[key] = region_aggregate(
+                df,
+                region_col=region_col,
+                value_col=value_col,
+                agg=agg,
+                lat_col=lat_col,
+                lon_col=lon_col,
+                presorted=region_col in sorted_by,
+            )
+        except (TypeError, ValueError):
+            # Not aggregatable as-is; callers get the error on demand instead.
+            continue
+    return out
+
+
 class DatasetStore:
     """
     Simple in-memory dataset store.
@@ -29,42 +99,85 @@ class DatasetStore:
         self._lock = RLock()
         self._data: Dict[str, pd.DataFrame] = {}
         self._names: Dict[str, str] = {}
+        self._agg_cache: Dict[str, Dict[AggKey, pd.DataFrame]] = {}
+        self._sorted_by: Dict[str, FrozenSet[str]] = {}
 
     def list(self) -> List[DatasetMeta]:
         with self._lock:
-            out: List[DatasetMeta] = []
-            for dataset_id, df in self._data.items():
-                out.append(
-                    DatasetMeta(
-                        dataset_id=dataset_id,
-                        name=self._names.get(dataset_id, dataset_id),
-                        rows=int(len(df)),
-                        columns=[str(c) for c in df.columns.to_list()],
-                    )
+            items = list(self._data.items())
+            names = dict(self._names)
+        out: List[DatasetMeta] = []
+        for dataset_id, df in items:
+            out.append(
+                DatasetMeta(
+                    dataset_id=dataset_id,
+                    name=names.get(dataset_id, dataset_id),
+                    rows=int(len(df)),
+                    columns=[str(c) for c in df.columns.to_list()],
                 )
-            return sorted(out, key=lambda m: m.name.lower())
+            )
+        return sorted(out, key=lambda m: m.name.lower())
 
     def get(self, dataset_id: str) -> pd.DataFrame:
-        with self._lock:
-            if dataset_id not in self._data:
-                raise KeyError(dataset_id)
-            return self._data[dataset_id]
+        # Lock-free: single dict reads are atomic, and writers publish
+        # `_data` last (see `_put`). Raises KeyError for unknown IDs.
+        return self._data[dataset_id]
+
+    def aggregate(
+        self,
+        dataset_id: str,
+        *,
+        region_col: str,
+        value_col: str,
+        agg: str = "sum",
+        lat_col: Optional[str] = None,
+        lon_col: Optional[str] = None,
+        df: Optional[pd.DataFrame] = None,
+    ) -> pd.DataFrame:
+        """
+        `analytics.region_aggregate` for a stored dataset, served from the
+        aggregates precomputed at ingest when the arguments match.
+
+        Pass `df` when the caller already resolved `dataset_id` to skip a
+        second lookup.
+        """
+        key: AggKey = (region_col, value_col, agg, lat_col, lon_col)
+        cached = self._agg_cache.get(dataset_id, {}).get(key)
+        if cached is not None:
+            return cached
+        return region_aggregate(
+            self.get(dataset_id) if df is None else df,
+            region_col=region_col,
+            value_col=value_col,
+            agg=agg,
+            lat_col=lat_col,
+            lon_col=lon_col,
+            presorted=region_col in self._sorted_by.get(dataset_id, ()),
+        )
 
     def put_dataframe(self, df: pd.DataFrame, *, name: Optional[str] = None) -> DatasetMeta:
-        dataset_id = uuid4().hex[:12]
+        dataset_id = secrets.token_hex(6)
+        name = name or dataset_id
+        rows = int(len(df))
+        columns = [str(c) for c in df.columns.to_list()]
+        self._put(dataset_id, df, name=name)
+        return DatasetMeta(dataset_id=dataset_id, name=name, rows=rows, columns=columns)
+
+    def _put(self, dataset_id: str, df: pd.DataFrame, *, name: str) -> None:
+        index = df.index
+        if not (isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1):
+            df = df.reset_index(drop=True)
+        df = _categorize(df)
+        sorted_by = _sorted_columns(df)
+        aggregates = _precompute_aggregates(df, sorted_by)
         with self._lock:
-            self._data[dataset_id] = df.reset_index(drop=True)
-            self._names[dataset_id] = name or dataset_id
-            meta = DatasetMeta(
-                dataset_id=dataset_id,
-                name=self._names[dataset_id],
-                rows=int(len(df)),
-                columns=[str(c) for c in df.columns.to_list()],
-            )
-        return meta
+            self._sorted_by[dataset_id] = sorted_by
+            self._agg_cache[dataset_id] = aggregates
+            self._names[dataset_id] = name
+            self._data[dataset_id] = df
 
     def put_records(self, records: List[Dict[str, Any]], *, name: Optional[str] = None) -> DatasetMeta:
-        df = pd.DataFrame.from_records(records)
+        df = pd.DataFrame(records)
         return self.put_dataframe(df, name=name)
 
 
@@ -97,7 +210,5 @@ STORE = DatasetStore()
 SAMPLE_DATASET_ID = "sample"
 
 # Load sample dataset deterministically under a stable ID.
-with STORE._lock:  # noqa: SLF001 - module-level bootstrap
-    STORE._data[SAMPLE_DATASET_ID] = _sample_dataset()
-    STORE._names[SAMPLE_DATASET_ID] = "Sample dataset"
+STORE._put(SAMPLE_DATASET_ID, _sample_dataset(), name="Sample dataset")  # noqa: SLF001 - module-level bootstrap
 
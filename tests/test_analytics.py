@@ -0,0 +1,113 @@
+import pandas as pd
+import pytest
+
+from analytics import executive_summary, region_aggregate, trends
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame.from_records(
+        [
+            {"region": "A", "date": "2025-01-15", "revenue": 100},
+            {"region": "A", "date": "2025-02-15", "revenue": 150},
+            {"region": "B", "date": "2025-01-15", "revenue": 90},
+            {"region": "C", "date": "2025-02-15", "revenue": 40},
+        ]
+    )
+
+
+def test_region_aggregate_is_cached_per_frame():
+    df = _frame()
+    first = region_aggregate(df, region_col="region", value_col="revenue")
+    again = region_aggregate(df, region_col="region", value_col="revenue", agg="sum")
+    assert again is first
+    assert region_aggregate(_frame(), region_col="region", value_col="revenue") is not first
+
+    series = trends(df, date_col="date", region_col="region", value_col="revenue")
+    assert trends(df, date_col="date", region_col="region", value_col="revenue") is series
+
+
+def test_executive_summary_rankings():
+    out = executive_summary(_frame(), metric="revenue", region_col="region", value_col="revenue", top_n=2)
+    assert list(out["regional_comparison"]) == ["A", "B", "C"]
+    assert out["summary"] == "A leads on revenue (sum), while C lags."
+
+
+def test_region_aggregate_on_categorical_regions():
+    df = _frame().astype({"region": "category"})
+    out = region_aggregate(df, region_col="region", value_col="revenue")
+    assert not isinstance(out["region"].dtype, pd.CategoricalDtype)
+    assert out["region"].tolist() == ["A", "B", "C"]
+
+
+def test_region_aggregate_kernels_match_pandas():
+    df = _frame().astype({"region": "category"})
+    # Float values that expose naive summation: eight 0.1s and cent amounts.
+    floats = pd.DataFrame(
+        {
+            "region": pd.Categorical(["A"] * 8 + ["B"] * 3),
+            "revenue": [0.1] * 8 + [19.99, 0.01, 1e16],
+        }
+    )
+    for frame in (df, floats):
+        for agg in ("sum", "mean", "count", "min", "max"):
+            for presorted in (False, True):
+                out = region_aggregate(
+                    frame, region_col="region", value_col="revenue", agg=agg, presorted=presorted
+                )
+                expected = frame.groupby("region", observed=True)["revenue"].agg(agg)
+                assert dict(zip(out["region"], out["value"])) == expected.to_dict()
+
+
+def test_region_aggregate_presorted_matches_hash_path():
+    df = _frame().astype({"region": "category"})
+    for agg in ("sum", "mean", "count", "min", "max"):
+        fast = region_aggregate(df, region_col="region", value_col="revenue", agg=agg, presorted=True)
+        slow = region_aggregate(df, region_col="region", value_col="revenue", agg=agg)
+        pd.testing.assert_frame_equal(fast, slow)
+
+
+def test_repeated_column_names_are_rejected():
+    df = pd.DataFrame([["A", 1, "x"], ["B", 2, "y"]], columns=["region", "revenue", "region"])
+    with pytest.raises(ValueError, match="region"):
+        region_aggregate(df, region_col="region", value_col="revenue")
+
+
+@pytest.mark.parametrize("freq", ["D", "W", "ME", "YE"])
+def test_trends_buckets_match_pandas_grouper(freq):
+    # Spans a week boundary (Sun 2023-12-31 / Mon 2024-01-01), a year boundary
+    # and a month end, with intra-day timestamps.
+    df = pd.DataFrame.from_records(
+        [
+            {"region": "A", "date": "2023-12-29T08:00:00", "revenue": 1},
+            {"region": "A", "date": "2023-12-31T23:59:00", "revenue": 2},
+            {"region": "B", "date": "2023-12-31T00:00:00", "revenue": 4},
+            {"region": "A", "date": "2024-01-01T00:00:00", "revenue": 8},
+            {"region": "B", "date": "2024-01-07T12:00:00", "revenue": 16},
+            {"region": "A", "date": "2024-01-08T01:00:00", "revenue": 32},
+            {"region": "B", "date": "2024-02-29T18:00:00", "revenue": 64},
+            {"region": "A", "date": "2024-03-01T00:00:00", "revenue": 128},
+        ]
+    )
+    out = trends(df, date_col="date", region_col="region", value_col="revenue", freq=freq)
+
+    tmp = df.assign(date=pd.to_datetime(df["date"], utc=True)).set_index("date")
+    expected = tmp.groupby([pd.Grouper(freq=freq), "region"])["revenue"].sum().reset_index()
+    expected["date"] = expected["date"].dt.date.astype(str)
+    expected = expected.sort_values(["date", "region"]).reset_index(drop=True)
+
+    assert out["date"].tolist() == expected["date"].tolist()
+    assert out["region"].tolist() == expected["region"].tolist()
+    assert out["value"].tolist() == expected["revenue"].tolist()
+
+
+def test_counting_reductions_on_text_values():
+    df = _frame().assign(customer=["c1", "c2", "c1", None])
+    counts = region_aggregate(df, region_col="region", value_col="customer", agg="count")
+    assert dict(zip(counts["region"], counts["value"])) == {"A": 2, "B": 1, "C": 0}
+    unique = region_aggregate(df, region_col="region", value_col="customer", agg="nunique")
+    assert dict(zip(unique["region"], unique["value"])) == {"A": 2, "B": 1, "C": 0}
+    sizes = region_aggregate(df, region_col="region", value_col="customer", agg="size")
+    assert dict(zip(sizes["region"], sizes["value"])) == {"A": 2, "B": 1, "C": 1}
+
+    out = executive_summary(df, metric="customers", region_col="region", value_col="customer", agg="nunique")
+    assert out["summary"] == "A leads on customers (nunique), while C lags."
@@ -42,11 +42,59 @@ def test_ingest_json_and_analytics():
     res2 = client.get(f"/api/analytics/regions?dataset_id={dataset_id}&value_col=revenue&agg=sum")
     assert res2.status_code == 200
     regions = res2.json()["regions"]
-    assert [r["region"] for r in regions] == ["A", "B"]
-    assert regions[0]["value"] == 250
+    assert regions["region"] == ["A", "B"]
+    assert regions["value"][0] == 250
 
     res3 = client.get(f"/api/analytics/trends?dataset_id={dataset_id}&date_col=date&region_col=region&value_col=revenue")
     assert res3.status_code == 200
     series = res3.json()["series"]
-    assert any(p["region"] == "A" for p in series)
+    assert series["date"] == ["2025-01-31", "2025-01-31", "2025-02-28"]
+    assert series["region"] == ["A", "B", "A"]
+    assert series["value"] == [100.0, 90.0, 150.0]
 
+
+def test_ingest_csv():
+    body = b"region,date,revenue\nA,2025-01-01,100\nA,2025-02-01,150\nB,2025-01-01,90\n"
+    res = client.post("/api/datasets/csv?name=unit-csv", files={"file": ("data.csv", body, "text/csv")})
+    assert res.status_code == 200
+    assert res.json()["rows"] == 3
+    assert res.json()["columns"] == ["region", "date", "revenue"]
+
+    res2 = client.get(f"/api/analytics/regions?dataset_id={res.json()['dataset_id']}")
+    assert res2.status_code == 200
+    assert res2.json()["regions"]["value"] == [250, 90]
+
+    # Header names follow pd.read_csv: repeats get ".N" on the base name, blanks become "Unnamed: i".
+    for header, expected in [
+        (b"region,revenue,revenue", ["region", "revenue", "revenue.1"]),
+        (b"a,a.1,a", ["a", "a.1", "a.2"]),
+        (b"a,a,a.1", ["a", "a.2", "a.1"]),
+        (b",,", ["Unnamed: 0", "Unnamed: 1", "Unnamed: 2"]),
+    ]:
+        dup = client.post("/api/datasets/csv", files={"file": ("dup.csv", header + b"\nA,1,2\n", "text/csv")})
+        assert dup.status_code == 200
+        assert dup.json()["columns"] == expected
+
+    blank = client.post("/api/datasets/csv", files={"file": ("blank.csv", b"region,revenue\nA,1\n,2\n", "text/csv")})
+    assert blank.status_code == 200
+    res3 = client.get(f"/api/analytics/regions?dataset_id={blank.json()['dataset_id']}")
+    # A blank region cell is missing (null), as with pd.read_csv, not a region named "".
+    assert res3.json()["regions"]["region"] == [None, "A"]
+
+    bad = client.post("/api/datasets/csv", files={"file": ("data.csv", b"a,b\n1,2,3\n", "text/csv")})
+    assert bad.status_code == 400
+
+
+def test_canonical_aggregates_precomputed_at_ingest():
+    from store import STORE
+
+    assert ("region", "revenue", "sum", None, None) in STORE._agg_cache["sample"]
+    res = client.get("/api/analytics/regions?dataset_id=sample&value_col=revenue&agg=sum")
+    assert res.json()["regions"]["region"][0] == "North America"
+
+
+def test_unknown_dataset_returns_404():
+    for url in ("/api/regions?dataset_id=missing", "/api/analytics/trends?dataset_id=missing", "/api/datasets/missing/schema"):
+        res = client.get(url)
+        assert res.status_code == 404
+        assert res.json() == {"detail": "Unknown dataset_id: missing"}
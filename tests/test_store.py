@@ -0,0 +1,14 @@
+import pandas as pd
+
+from store import _categorize
+
+
+def test_categorize_handles_repeated_column_names():
+    df = pd.DataFrame(
+        [["A", 1, "x"], ["A", 2, "x"], ["A", 3, "y"], ["A", 4, "x"], ["A", 5, "x"]],
+        columns=["region", "revenue", "region"],
+    )
+    out = _categorize(df)
+    assert [isinstance(t, pd.CategoricalDtype) for t in out.dtypes] == [True, False, True]
+    # The caller's frame is left untouched.
+    assert not any(isinstance(t, pd.CategoricalDtype) for t in df.dtypes)